@@ -0,0 +1,255 @@
+"""
+Customer Data API - Whitelisted endpoints for customer-scoped ERPNext documents.
+
+This module provides API endpoints for:
+- Listing Sales Orders, Sales Invoices and Payment Entries of the user's customer
+- Keyset (cursor) pagination over those documents
+- Cached summary totals per customer and module
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+from customer_portal_manager.api.portal_api import is_portal_admin
+
+
+DEFAULT_PAGE_LENGTH = 20
+MAX_PAGE_LENGTH = 100
+SUMMARY_CACHE_TTL = 300
+
+# Module key -> document source. Only the listed fields are ever selected.
+DOCUMENT_SOURCES = {
+    "orders": {
+        "doctype": "Sales Order",
+        "customer_field": "customer",
+        "date_field": "transaction_date",
+        "fields": [
+            "name", "transaction_date", "delivery_date", "status",
+            "currency", "grand_total", "per_delivered", "per_billed"
+        ],
+        "totals": {"grand_total": "grand_total"}
+    },
+    "invoices": {
+        "doctype": "Sales Invoice",
+        "customer_field": "customer",
+        "date_field": "posting_date",
+        "fields": [
+            "name", "posting_date", "due_date", "status",
+            "currency", "grand_total", "outstanding_amount"
+        ],
+        "totals": {
+            "grand_total": "grand_total",
+            "outstanding_amount": "outstanding_amount"
+        }
+    },
+    "payments": {
+        "doctype": "Payment Entry",
+        "customer_field": "party",
+        "date_field": "posting_date",
+        "extra_conditions": "party_type = 'Customer' AND payment_type = 'Receive'",
+        "fields": [
+            "name", "posting_date", "payment_type", "mode_of_payment",
+            "paid_amount", "paid_from_account_currency", "reference_no",
+            "reference_date"
+        ],
+        "totals": {"paid_amount": "paid_amount"}
+    }
+}
+
+
+# =============================================================================
+# Helper Functions
+# =============================================================================
+
+def resolve_customer(module_key, customer=None, user=None):
+    """
+    Resolve the customer whose documents the user may read for a module.
+    Admins must pass a customer; portal users are always scoped to their own
+    customer and need the module enabled on their Customer Portal User.
+    """
+    if not user:
+        user = frappe.session.user
+
+    if is_portal_admin(user):
+        if not customer:
+            frappe.throw(_("Customer is required"))
+        return customer
+
+    portal_user = frappe.db.get_value(
+        "Customer Portal User",
+        {"user": user, "enabled": 1},
+        ["name", "customer"],
+        as_dict=True
+    )
+    if not portal_user:
+        frappe.throw(
+            _("You are not linked to a customer portal"),
+            frappe.PermissionError
+        )
+
+    if customer and customer != portal_user.customer:
+        frappe.throw(
+            _("You do not have permission to access this customer's data"),
+            frappe.PermissionError
+        )
+
+    has_module = frappe.db.exists(
+        "Customer Portal Module",
+        {
+            "parenttype": "Customer Portal User",
+            "parent": portal_user.name,
+            "module_key": module_key,
+            "enabled": 1
+        }
+    )
+    if not has_module:
+        frappe.throw(
+            _("You do not have access to the {0} module").format(module_key),
+            frappe.PermissionError
+        )
+
+    return portal_user.customer
+
+
+def get_base_conditions(source):
+    """Build the WHERE clause shared by list and summary queries."""
+    conditions = [
+        f"`{source['customer_field']}` = %(customer)s",
+        "docstatus = 1"
+    ]
+    if source.get("extra_conditions"):
+        conditions.append(source["extra_conditions"])
+    return conditions
+
+
+def get_documents(module_key, customer=None, cursor=None, page_length=None):
+    """
+    Return one page of documents for a module, newest first.
+
+    Pagination is keyset based on (date, name): the cursor is the date and
+    name of the last row of the previous page. Together with the (customer,
+    date, name) indexes added by the add_customer_document_indexes patch,
+    every page is an index range scan regardless of how deep the caller has
+    paged.
+    """
+    source = DOCUMENT_SOURCES[module_key]
+    customer = resolve_customer(module_key, customer)
+
+    page_length = cint(page_length) or DEFAULT_PAGE_LENGTH
+    page_length = min(max(page_length, 1), MAX_PAGE_LENGTH)
+
+    date_field = source["date_field"]
+    conditions = get_base_conditions(source)
+    values = {"customer": customer, "limit": page_length + 1}
+
+    if cursor:
+        if isinstance(cursor, str):
+            try:
+                cursor = frappe.parse_json(cursor)
+            except ValueError:
+                cursor = None
+        if (
+            not isinstance(cursor, dict)
+            or not cursor.get("date")
+            or not cursor.get("name")
+        ):
+            frappe.throw(_("Invalid cursor"))
+        conditions.append(
+            f"(`{date_field}` < %(cursor_date)s"
+            f" OR (`{date_field}` = %(cursor_date)s AND name < %(cursor_name)s))"
+        )
+        values["cursor_date"] = cursor["date"]
+        values["cursor_name"] = cursor["name"]
+
+    fields = ", ".join(f"`{field}`" for field in source["fields"])
+    rows = frappe.db.sql(
+        f"""
+            SELECT {fields}
+            FROM `tab{source['doctype']}`
+            WHERE {" AND ".join(conditions)}
+            ORDER BY `{date_field}` DESC, name DESC
+            LIMIT %(limit)s
+        """,
+        values,
+        as_dict=True
+    )
+
+    next_cursor = None
+    if len(rows) > page_length:
+        rows = rows[:page_length]
+        last = rows[-1]
+        next_cursor = {"date": str(last[date_field]), "name": last["name"]}
+
+    return {
+        "customer": customer,
+        "data": rows,
+        "next_cursor": next_cursor
+    }
+
+
+def get_summary(module_key, customer=None):
+    """Return document count and totals for a module, cached per customer."""
+    source = DOCUMENT_SOURCES[module_key]
+    customer = resolve_customer(module_key, customer)
+
+    cache_key = get_summary_cache_key(module_key, customer)
+    summary = frappe.cache().get_value(cache_key)
+    if summary is not None:
+        return summary
+
+    totals = ", ".join(
+        f"COALESCE(SUM(`{field}`), 0) AS `{alias}`"
+        for alias, field in source["totals"].items()
+    )
+    summary = frappe.db.sql(
+        f"""
+            SELECT COUNT(*) AS `count`, {totals}
+            FROM `tab{source['doctype']}`
+            WHERE {" AND ".join(get_base_conditions(source))}
+        """,
+        {"customer": customer},
+        as_dict=True
+    )[0]
+    summary["customer"] = customer
+
+    frappe.cache().set_value(
+        cache_key, summary, expires_in_sec=SUMMARY_CACHE_TTL
+    )
+    return summary
+
+
+def get_summary_cache_key(module_key, customer):
+    """Cache key for a customer's module summary."""
+    return f"customer_portal_manager:summary:{module_key}:{customer}"
+
+
+# =============================================================================
+# Whitelisted API Methods
+# =============================================================================
+
+@frappe.whitelist()
+def get_sales_orders(customer=None, cursor=None, page_length=None):
+    """Get a page of submitted Sales Orders for the user's customer."""
+    return get_documents("orders", customer, cursor, page_length)
+
+
+@frappe.whitelist()
+def get_sales_invoices(customer=None, cursor=None, page_length=None):
+    """Get a page of submitted Sales Invoices for the user's customer."""
+    return get_documents("invoices", customer, cursor, page_length)
+
+
+@frappe.whitelist()
+def get_payment_entries(customer=None, cursor=None, page_length=None):
+    """Get a page of submitted Payment Entries for the user's customer."""
+    return get_documents("payments", customer, cursor, page_length)
+
+
+@frappe.whitelist()
+def get_module_summary(module_key, customer=None):
+    """Get count and totals for the orders, invoices or payments module."""
+    if module_key not in DOCUMENT_SOURCES:
+        frappe.throw(_("Invalid module {0}").format(module_key))
+
+    return get_summary(module_key, customer)
@@ -10,7 +10,10 @@ This module provides API endpoints for:
 
 import frappe
 from frappe import _
+from frappe.utils import cint
 from customer_portal_manager.customer_portal_manager.demo_data import execute as generate_demo_data_script
+from customer_portal_manager.customer_portal_manager.contact_sync import execute as sync_contacts_script
+from customer_portal_manager.customer_portal_manager import user_archive
 
 # ... existing code ...
 
@@ -251,14 +254,26 @@ def toggle_user_status(portal_user_name, enabled):
     
     doc = frappe.get_doc("Customer Portal User", portal_user_name)
     doc.enabled = enabled
+    if not enabled:
+        doc.pending_activation = 0
     doc.save()
     
+    if doc.enabled:
+        message = _("User {0} has been enabled").format(doc.user)
+    elif enabled and doc.pending_activation:
+        message = _("User {0} will be enabled on {1}").format(
+            doc.user, frappe.format(doc.start_date, "Date")
+        )
+    elif enabled:
+        message = _("User {0} cannot be enabled because access ended on {1}").format(
+            doc.user, frappe.format(doc.end_date, "Date")
+        )
+    else:
+        message = _("User {0} has been disabled").format(doc.user)
+    
     return {
-        "success": True,
-        "message": _("User {0} has been {1}").format(
-            doc.user,
-            _("enabled") if enabled else _("disabled")
-        ),
+        "success": bool(doc.enabled) == bool(enabled),
+        "message": message,
         "user": doc.as_dict()
     }
 
@@ -326,6 +341,48 @@ def create_portal_user(customer, user, role=None, modules=None):
     }
 
 
+@frappe.whitelist()
+def sync_portal_users_from_contacts(dry_run=1, full=0):
+    """Create portal users from customer contacts changed since the last sync."""
+    if not is_portal_admin():
+        frappe.throw(
+            _("Only Customer Portal Admins can sync users"),
+            frappe.PermissionError
+        )
+    
+    return sync_contacts_script(dry_run=cint(dry_run), full=cint(full))
+
+
+@frappe.whitelist()
+def archive_disabled_users(days=None, dry_run=1):
+    """Move users disabled for at least `days` days into the archive."""
+    if not is_portal_admin():
+        frappe.throw(
+            _("Only Customer Portal Admins can archive users"),
+            frappe.PermissionError
+        )
+    
+    return user_archive.execute(days=days, dry_run=cint(dry_run))
+
+
+@frappe.whitelist()
+def restore_archived_user(archive_name):
+    """Restore an archived portal user as a disabled Customer Portal User."""
+    if not is_portal_admin():
+        frappe.throw(
+            _("Only Customer Portal Admins can restore users"),
+            frappe.PermissionError
+        )
+    
+    doc = user_archive.restore_user(archive_name)
+    
+    return {
+        "success": True,
+        "message": _("User {0} has been restored").format(doc.user),
+        "user": doc.as_dict()
+    }
+
+
 @frappe.whitelist()
 def get_available_modules():
     """Get list of available modules that can be assigned to users."""
@@ -382,5 +439,6 @@ def get_dashboard_stats():
         "disabled_users": frappe.db.count(
             "Customer Portal User",
             {"enabled": 0}
-        )
+        ),
+        "archived_users": frappe.db.count("Customer Portal User Archive")
     }
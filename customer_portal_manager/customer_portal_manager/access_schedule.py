@@ -0,0 +1,188 @@
+"""
+Access Schedule - Scheduled activation and expiry of Customer Portal Users.
+
+Users whose start date is still in the future are held back, users whose
+start date has been reached are enabled and users whose end date has passed
+are disabled. Rows are updated in set-based batches through the
+indexed date columns, and the Customer Portal User role is granted or revoked
+in bulk, so the job does not load or save individual documents.
+"""
+
+import frappe
+from frappe.utils import now, nowdate
+
+BATCH_SIZE = 1000
+PORTAL_USER_ROLE = "Customer Portal User"
+
+
+def update_user_access():
+    """Scheduler entry point: defer, activate and expire portal users for today."""
+    today = nowdate()
+    deferred = defer_users(today)
+    activated = activate_users(today)
+    expired = expire_users(today)
+    return {"deferred": deferred, "activated": activated, "expired": expired}
+
+
+def defer_users(today=None):
+    """Disable enabled users whose start date is after today until it arrives."""
+    today = today or nowdate()
+    total = 0
+
+    while True:
+        rows = frappe.db.sql("""
+            SELECT name, user
+            FROM `tabCustomer Portal User`
+            WHERE start_date > %(today)s AND enabled = 1
+            LIMIT %(limit)s
+        """, {"today": today, "limit": BATCH_SIZE}, as_dict=True)
+
+        if not rows:
+            break
+
+        frappe.db.sql("""
+            UPDATE `tabCustomer Portal User`
+            SET enabled = 0, pending_activation = 1, modified = %(modified)s
+            WHERE name IN %(names)s
+        """, {"names": tuple(r.name for r in rows), "modified": now()})
+
+        users = {r.user for r in rows}
+        revoke_portal_role(users)
+        clear_user_caches(users)
+        frappe.db.commit()
+
+        total += len(rows)
+
+    return total
+
+
+def activate_users(today=None):
+    """Enable pending users whose start date has arrived, unless their profile is disabled."""
+    today = today or nowdate()
+    total = 0
+
+    while True:
+        rows = frappe.db.sql("""
+            SELECT u.name, u.user
+            FROM `tabCustomer Portal User` u
+            LEFT JOIN `tabCustomer Portal Profile` p
+                ON p.name = u.portal_profile
+            WHERE u.pending_activation = 1
+                AND u.start_date <= %(today)s
+                AND (u.end_date IS NULL OR u.end_date >= %(today)s)
+                AND (p.name IS NULL OR p.enabled = 1)
+            LIMIT %(limit)s
+        """, {"today": today, "limit": BATCH_SIZE}, as_dict=True)
+
+        if not rows:
+            break
+
+        frappe.db.sql("""
+            UPDATE `tabCustomer Portal User`
+            SET enabled = 1, pending_activation = 0, disabled_on = NULL,
+                modified = %(modified)s
+            WHERE name IN %(names)s
+        """, {"names": tuple(r.name for r in rows), "modified": now()})
+
+        users = {r.user for r in rows}
+        grant_portal_role(users)
+        clear_user_caches(users)
+        frappe.db.commit()
+
+        total += len(rows)
+
+    return total
+
+
+def expire_users(today=None):
+    """Disable enabled and pending users whose end date is before today."""
+    today = today or nowdate()
+    total = 0
+
+    while True:
+        rows = frappe.db.sql("""
+            SELECT name, user
+            FROM `tabCustomer Portal User`
+            WHERE end_date < %(today)s
+                AND (enabled = 1 OR pending_activation = 1)
+            LIMIT %(limit)s
+        """, {"today": today, "limit": BATCH_SIZE}, as_dict=True)
+
+        if not rows:
+            break
+
+        frappe.db.sql("""
+            UPDATE `tabCustomer Portal User`
+            SET enabled = 0, pending_activation = 0, disabled_on = %(modified)s,
+                modified = %(modified)s
+            WHERE name IN %(names)s
+        """, {"names": tuple(r.name for r in rows), "modified": now()})
+
+        users = {r.user for r in rows}
+        revoke_portal_role(users)
+        clear_user_caches(users)
+        frappe.db.commit()
+
+        total += len(rows)
+
+    return total
+
+
+def grant_portal_role(users):
+    """Add the Customer Portal User role to users that do not have it yet."""
+    if not users:
+        return
+
+    existing = set(frappe.db.sql_list("""
+        SELECT parent
+        FROM `tabHas Role`
+        WHERE parenttype = 'User' AND role = %(role)s AND parent IN %(users)s
+    """, {"role": PORTAL_USER_ROLE, "users": tuple(users)}))
+
+    missing = [user for user in users if user not in existing]
+    if not missing:
+        return
+
+    timestamp = now()
+    frappe.db.bulk_insert(
+        "Has Role",
+        fields=[
+            "name", "parent", "parenttype", "parentfield", "role", "idx",
+            "owner", "modified_by", "creation", "modified"
+        ],
+        values=[
+            (
+                frappe.generate_hash(length=10), user, "User", "roles",
+                PORTAL_USER_ROLE, 0, "Administrator", "Administrator",
+                timestamp, timestamp
+            )
+            for user in missing
+        ]
+    )
+
+
+def revoke_portal_role(users):
+    """Remove the Customer Portal User role from users with no enabled record."""
+    if not users:
+        return
+
+    still_enabled = set(frappe.db.sql_list("""
+        SELECT DISTINCT user
+        FROM `tabCustomer Portal User`
+        WHERE enabled = 1 AND user IN %(users)s
+    """, {"users": tuple(users)}))
+
+    revoked = [user for user in users if user not in still_enabled]
+    if not revoked:
+        return
+
+    frappe.db.sql("""
+        DELETE FROM `tabHas Role`
+        WHERE parenttype = 'User' AND role = %(role)s AND parent IN %(users)s
+    """, {"role": PORTAL_USER_ROLE, "users": tuple(revoked)})
+
+
+def clear_user_caches(users):
+    """Drop cached roles and session data for the affected users."""
+    for user in users:
+        frappe.clear_cache(user=user)
@@ -0,0 +1,278 @@
+"""
+Contact Sync - Create Customer Portal Users from ERPNext Customer contacts.
+
+Contacts linked (through Dynamic Link) to a customer that has a Customer
+Portal Profile are mapped to Customer Portal User records. Only contacts
+modified since the stored high-water mark are read, in batches ordered by
+(modified, name), so each run touches just the recent changes. Customers whose
+portal profile was created since a separate profile high-water mark have all
+their contacts rescanned.
+"""
+
+import frappe
+from frappe import _
+
+BATCH_SIZE = 500
+HIGH_WATER_MARK_KEY = "customer_portal_manager_contact_sync_hwm"
+PROFILE_HIGH_WATER_MARK_KEY = "customer_portal_manager_contact_sync_profile_hwm"
+
+
+def sync_portal_users():
+    """Scheduler entry point: incremental sync that writes changes."""
+    return execute(dry_run=False)
+
+
+def execute(dry_run=True, full=False):
+    """
+    Sync portal users from customer contacts.
+
+    With dry_run, nothing is written and the high-water marks are left as is.
+    With full, the high-water marks are ignored and all contacts are scanned.
+    """
+    since = None if full else frappe.db.get_global(HIGH_WATER_MARK_KEY)
+    profile_since = None if full else (
+        frappe.db.get_global(PROFILE_HIGH_WATER_MARK_KEY) or since
+    )
+    cursor = (since or "1900-01-01 00:00:00", "")
+
+    result = {
+        "dry_run": dry_run,
+        "since": since,
+        "processed_contacts": 0,
+        "created": [],
+        "unchanged": 0,
+        "skipped": [],
+        "conflicts": []
+    }
+    # user -> customer for records created (or planned) during this run
+    planned = {}
+
+    if profile_since:
+        new_profiles = get_new_profiles(profile_since)
+        profile_mark = str(new_profiles[-1].creation) if new_profiles else profile_since
+        if new_profiles:
+            customers = [p.customer for p in new_profiles]
+            last_name = ""
+            while True:
+                contacts = get_profile_contact_batch(customers, last_name)
+                if not contacts:
+                    break
+
+                sync_batch(contacts, planned, result, dry_run, customers)
+                last_name = contacts[-1].name
+
+                if not dry_run:
+                    frappe.db.commit()
+    else:
+        # Full scan: every existing profile is covered by the contact pass
+        profile_mark = get_latest_profile_creation()
+
+    while True:
+        contacts = get_contact_batch(cursor)
+        if not contacts:
+            break
+
+        sync_batch(contacts, planned, result, dry_run)
+        last = contacts[-1]
+        cursor = (str(last.modified), last.name)
+
+        if not dry_run:
+            frappe.db.set_global(HIGH_WATER_MARK_KEY, cursor[0])
+            frappe.db.commit()
+
+    # Only advance the profile mark once every contact has been processed
+    if not dry_run and profile_mark:
+        frappe.db.set_global(PROFILE_HIGH_WATER_MARK_KEY, profile_mark)
+        frappe.db.commit()
+
+    result["high_water_mark"] = cursor[0] if result["processed_contacts"] else since
+    result["profile_high_water_mark"] = profile_mark
+    return result
+
+
+def sync_batch(contacts, planned, result, dry_run, customers=None):
+    """Sync one batch of contacts, optionally limited to some customers."""
+    links = get_customer_links([c.name for c in contacts], customers)
+    users = [c.user for c in contacts if c.user]
+    existing = get_existing_portal_users(users)
+    archived = get_archived_users(users)
+
+    for contact in contacts:
+        for link in links.get(contact.name, []):
+            sync_contact(contact, link, existing, archived, planned, result, dry_run)
+
+    result["processed_contacts"] += len(contacts)
+
+
+def get_new_profiles(since):
+    """Portal profiles created after the profile high-water mark."""
+    return frappe.get_all(
+        "Customer Portal Profile",
+        filters={"creation": [">", since]},
+        fields=["customer", "creation"],
+        order_by="creation asc"
+    )
+
+
+def get_latest_profile_creation():
+    """Creation time of the newest portal profile, if any."""
+    latest = frappe.db.sql("""
+        SELECT MAX(creation) FROM `tabCustomer Portal Profile`
+    """)[0][0]
+    return str(latest) if latest else None
+
+
+def get_profile_contact_batch(customers, last_name):
+    """Next batch of contacts linked to any of the given customers."""
+    return frappe.db.sql("""
+        SELECT DISTINCT c.name, c.user, c.modified
+        FROM `tabContact` c
+        INNER JOIN `tabDynamic Link` dl
+            ON dl.parent = c.name
+            AND dl.parenttype = 'Contact'
+            AND dl.link_doctype = 'Customer'
+        WHERE dl.link_name IN %(customers)s AND c.name > %(name)s
+        ORDER BY c.name ASC
+        LIMIT %(limit)s
+    """, {"customers": tuple(customers), "name": last_name, "limit": BATCH_SIZE}, as_dict=True)
+
+
+def get_contact_batch(cursor):
+    """Next batch of contacts linked to a customer with a portal profile."""
+    return frappe.db.sql("""
+        SELECT c.name, c.user, c.modified
+        FROM `tabContact` c
+        WHERE (c.modified > %(modified)s
+                OR (c.modified = %(modified)s AND c.name > %(name)s))
+            AND EXISTS (
+                SELECT 1
+                FROM `tabDynamic Link` dl
+                INNER JOIN `tabCustomer Portal Profile` p
+                    ON p.customer = dl.link_name
+                WHERE dl.parent = c.name
+                    AND dl.parenttype = 'Contact'
+                    AND dl.link_doctype = 'Customer'
+            )
+        ORDER BY c.modified ASC, c.name ASC
+        LIMIT %(limit)s
+    """, {"modified": cursor[0], "name": cursor[1], "limit": BATCH_SIZE}, as_dict=True)
+
+
+def get_customer_links(contact_names, customers=None):
+    """
+    Map contact name -> customers with a portal profile it is linked to,
+    along with whether that profile is enabled.
+    """
+    conditions = ""
+    values = {"contacts": tuple(contact_names)}
+    if customers:
+        conditions = "AND dl.link_name IN %(customers)s"
+        values["customers"] = tuple(customers)
+
+    rows = frappe.db.sql(f"""
+        SELECT dl.parent, dl.link_name AS customer, p.enabled AS profile_enabled
+        FROM `tabDynamic Link` dl
+        INNER JOIN `tabCustomer Portal Profile` p ON p.customer = dl.link_name
+        WHERE dl.parenttype = 'Contact'
+            AND dl.link_doctype = 'Customer'
+            AND dl.parent IN %(contacts)s
+            {conditions}
+        ORDER BY dl.parent, dl.idx
+    """, values, as_dict=True)
+
+    links = {}
+    for row in rows:
+        links.setdefault(row.pop("parent"), []).append(row)
+    return links
+
+
+def get_existing_portal_users(users):
+    """Map user -> customer for users that already have a portal record."""
+    if not users:
+        return {}
+
+    return {
+        row.user: row.customer
+        for row in frappe.get_all(
+            "Customer Portal User",
+            filters={"user": ["in", users]},
+            fields=["user", "customer"]
+        )
+    }
+
+
+def get_archived_users(users):
+    """Users that have a record in Customer Portal User Archive."""
+    if not users:
+        return set()
+
+    return set(frappe.get_all(
+        "Customer Portal User Archive",
+        filters={"user": ["in", users]},
+        pluck="user"
+    ))
+
+
+def sync_contact(contact, link, existing, archived, planned, result, dry_run):
+    """
+    Create the portal user for one contact/customer pair, or report why not.
+    Users of a disabled profile are created disabled.
+    """
+    customer = link.customer
+    if not contact.user:
+        result["skipped"].append({
+            "contact": contact.name,
+            "customer": customer,
+            "reason": _("Contact has no linked user")
+        })
+        return
+
+    if contact.user in archived and contact.user not in existing:
+        result["skipped"].append({
+            "contact": contact.name,
+            "customer": customer,
+            "user": contact.user,
+            "reason": _("User is archived; restore it instead")
+        })
+        return
+
+    current = existing.get(contact.user) or planned.get(contact.user)
+    if current == customer:
+        result["unchanged"] += 1
+        return
+
+    if current:
+        result["conflicts"].append({
+            "contact": contact.name,
+            "customer": customer,
+            "user": contact.user,
+            "reason": _("User is already linked to customer {0}").format(current)
+        })
+        return
+
+    if not dry_run:
+        doc = frappe.new_doc("Customer Portal User")
+        doc.customer = customer
+        doc.user = contact.user
+        doc.enabled = 1 if link.profile_enabled else 0
+        save_point = "contact_sync"
+        frappe.db.savepoint(save_point)
+        try:
+            doc.insert(ignore_permissions=True)
+        except frappe.ValidationError as e:
+            frappe.db.rollback(save_point=save_point)
+            result["conflicts"].append({
+                "contact": contact.name,
+                "customer": customer,
+                "user": contact.user,
+                "reason": str(e)
+            })
+            return
+
+    planned[contact.user] = customer
+    result["created"].append({
+        "contact": contact.name,
+        "customer": customer,
+        "user": contact.user,
+        "enabled": 1 if link.profile_enabled else 0
+    })
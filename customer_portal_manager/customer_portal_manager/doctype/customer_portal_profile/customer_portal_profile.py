@@ -5,6 +5,7 @@ Customer Portal Profile - DocType Controller
 import frappe
 from frappe import _
 from frappe.model.document import Document
+from frappe.utils import now
 
 
 class CustomerPortalProfile(Document):
@@ -40,9 +41,12 @@ class CustomerPortalProfile(Document):
         if not self.enabled:
             frappe.db.sql("""
                 UPDATE `tabCustomer Portal User`
-                SET enabled = 0
-                WHERE portal_profile = %s AND enabled = 1
-            """, (self.name,))
+                SET disabled_on = IF(enabled = 1, %s, disabled_on),
+                    enabled = 0,
+                    pending_activation = 0
+                WHERE portal_profile = %s
+                    AND (enabled = 1 OR pending_activation = 1)
+            """, (now(), self.name))
 
 
 def validate_portal_profile(doc, method):
@@ -5,6 +5,7 @@ Customer Portal User - DocType Controller
 import frappe
 from frappe import _
 from frappe.model.document import Document
+from frappe.utils import getdate, now, nowdate
 
 
 class CustomerPortalUser(Document):
@@ -13,7 +14,10 @@ class CustomerPortalUser(Document):
     def validate(self):
         """Validate user data before saving."""
         self.validate_user_unique()
+        self.validate_dates()
         self.auto_link_portal_profile()
+        self.apply_access_window()
+        self.set_disabled_on()
     
     def validate_user_unique(self):
         """Ensure a user can only be linked to one customer."""
@@ -30,6 +34,59 @@ class CustomerPortalUser(Document):
                     )
                 )
     
+    def validate_dates(self):
+        """Ensure the end date is not before the start date."""
+        if self.start_date and self.end_date:
+            if getdate(self.end_date) < getdate(self.start_date):
+                frappe.throw(_("End Date cannot be before Start Date"))
+    
+    def apply_access_window(self):
+        """Keep the enabled flag consistent with the start and end dates."""
+        today = getdate(nowdate())
+        
+        if not self.enabled and (self.is_new() or self.has_value_changed("enabled")):
+            # An explicit disable cancels any scheduled activation
+            self.pending_activation = 0
+        
+        if self.end_date and getdate(self.end_date) < today:
+            if self.pending_activation:
+                # Access ended before it started
+                self.disabled_on = now()
+            self.enabled = 0
+            self.pending_activation = 0
+        elif self.start_date and getdate(self.start_date) > today:
+            if self.enabled:
+                self.enabled = 0
+                self.pending_activation = 1
+        else:
+            if self.pending_activation:
+                # Start date reached before the daily job ran
+                if self.is_profile_enabled():
+                    self.enabled = 1
+                else:
+                    self.disabled_on = now()
+            self.pending_activation = 0
+    
+    def is_profile_enabled(self):
+        """Check whether the linked portal profile, if any, is enabled."""
+        if not self.portal_profile:
+            return True
+        
+        return bool(frappe.db.get_value(
+            "Customer Portal Profile", self.portal_profile, "enabled"
+        ))
+    
+    def set_disabled_on(self):
+        """Record when an existing user was disabled, and clear it on enable."""
+        if self.enabled:
+            self.disabled_on = None
+        elif (
+            not self.is_new()
+            and not self.pending_activation
+            and self.has_value_changed("enabled")
+        ):
+            self.disabled_on = now()
+    
     def auto_link_portal_profile(self):
         """Automatically link to the customer's portal profile if it exists."""
         if not self.portal_profile and self.customer:
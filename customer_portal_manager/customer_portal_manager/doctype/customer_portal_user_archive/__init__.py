@@ -0,0 +1 @@
+# Customer Portal User Archive DocType
@@ -0,0 +1,11 @@
+"""
+Customer Portal User Archive - DocType Controller
+"""
+
+import frappe
+from frappe.model.document import Document
+
+
+class CustomerPortalUserArchive(Document):
+    """Archived copy of a long-disabled Customer Portal User and its modules."""
+    pass
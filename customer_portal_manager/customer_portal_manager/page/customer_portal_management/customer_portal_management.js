@@ -466,8 +466,11 @@ class CustomerPortalManagement {
             method: 'customer_portal_manager.api.portal_api.toggle_user_status',
             args: { portal_user_name: user, enabled: enabled ? 1 : 0 },
             callback: function (r) {
-                if (r.message && r.message.success) {
-                    frappe.show_alert({ message: r.message.message, indicator: 'green' });
+                if (r.message) {
+                    frappe.show_alert({
+                        message: r.message.message,
+                        indicator: r.message.success ? 'green' : 'orange'
+                    });
                     self.load_data();
                 }
             }
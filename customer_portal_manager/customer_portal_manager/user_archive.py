@@ -0,0 +1,151 @@
+"""
+User Archive - Move long-disabled Customer Portal Users out of the hot tables.
+
+Users (and their Customer Portal Module rows) that were disabled a number of
+days ago and not re-enabled since are copied into Customer Portal User Archive
+and deleted from the live tables in batches. Archived users no longer show
+up in portal listings or counts and can be restored individually.
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, cint, now, nowdate
+
+ARCHIVE_AFTER_DAYS = 365
+BATCH_SIZE = 500
+
+USER_FIELDS = [
+    "name", "customer", "portal_profile", "user", "role",
+    "start_date", "end_date", "disabled_on"
+]
+
+
+def archive_users():
+    """Scheduler entry point: archive users disabled for a year or more."""
+    return execute(dry_run=False)
+
+
+def execute(days=None, dry_run=True):
+    """
+    Archive users disabled for at least `days` days.
+
+    Returns how many rows were (or, with dry_run, would be) archived and the
+    size of the live Customer Portal User table before and after.
+    """
+    days = cint(days) or ARCHIVE_AFTER_DAYS
+    cutoff = add_days(nowdate(), -days)
+    filters = {"enabled": 0, "pending_activation": 0, "disabled_on": ["<", cutoff]}
+
+    rows_before = frappe.db.count("Customer Portal User")
+    result = {
+        "dry_run": dry_run,
+        "cutoff": cutoff,
+        "rows_before": rows_before,
+        "archived_users": 0,
+        "archived_modules": 0
+    }
+
+    if dry_run:
+        result["archived_users"] = frappe.db.count("Customer Portal User", filters)
+        result["archived_modules"] = frappe.db.sql("""
+            SELECT COUNT(*)
+            FROM `tabCustomer Portal Module` m
+            INNER JOIN `tabCustomer Portal User` u ON u.name = m.parent
+            WHERE m.parenttype = 'Customer Portal User'
+                AND u.enabled = 0
+                AND u.pending_activation = 0
+                AND u.disabled_on < %(cutoff)s
+        """, {"cutoff": cutoff})[0][0]
+        result["rows_after"] = rows_before - result["archived_users"]
+        return result
+
+    while True:
+        users = frappe.get_all(
+            "Customer Portal User",
+            filters=filters,
+            fields=USER_FIELDS,
+            order_by="name asc",
+            limit_page_length=BATCH_SIZE
+        )
+        if not users:
+            break
+
+        result["archived_modules"] += archive_batch(users)
+        result["archived_users"] += len(users)
+        frappe.db.commit()
+
+    result["rows_after"] = frappe.db.count("Customer Portal User")
+    return result
+
+
+def archive_batch(users):
+    """Copy a batch of users into the archive and delete the live rows."""
+    names = [u.name for u in users]
+
+    modules = {}
+    for row in frappe.get_all(
+        "Customer Portal Module",
+        filters={"parenttype": "Customer Portal User", "parent": ["in", names]},
+        fields=["parent", "module_name", "module_key", "enabled"],
+        order_by="parent asc, idx asc"
+    ):
+        modules.setdefault(row.pop("parent"), []).append(row)
+
+    timestamp = now()
+    frappe.db.bulk_insert(
+        "Customer Portal User Archive",
+        fields=[
+            "name", "portal_user", "customer", "portal_profile", "user",
+            "role", "start_date", "end_date", "disabled_on", "archived_on",
+            "modules", "owner", "modified_by", "creation", "modified"
+        ],
+        values=[
+            (
+                frappe.generate_hash(length=10), u.name, u.customer,
+                u.portal_profile, u.user, u.role, u.start_date, u.end_date,
+                u.disabled_on, timestamp, frappe.as_json(modules.get(u.name, [])),
+                frappe.session.user, frappe.session.user, timestamp, timestamp
+            )
+            for u in users
+        ]
+    )
+
+    frappe.db.sql("""
+        DELETE FROM `tabCustomer Portal Module`
+        WHERE parenttype = 'Customer Portal User' AND parent IN %(names)s
+    """, {"names": tuple(names)})
+    frappe.db.sql("""
+        DELETE FROM `tabCustomer Portal User`
+        WHERE name IN %(names)s
+    """, {"names": tuple(names)})
+
+    return sum(len(m) for m in modules.values())
+
+
+def restore_user(archive_name):
+    """Recreate a disabled Customer Portal User from its archive record."""
+    archive = frappe.get_doc("Customer Portal User Archive", archive_name)
+
+    if frappe.db.exists("Customer Portal User", archive.portal_user):
+        frappe.throw(
+            _("Portal user {0} already exists").format(archive.portal_user)
+        )
+
+    doc = frappe.new_doc("Customer Portal User")
+    doc.customer = archive.customer
+    doc.portal_profile = archive.portal_profile
+    doc.user = archive.user
+    doc.role = archive.role
+    doc.start_date = archive.start_date
+    doc.end_date = archive.end_date
+    doc.enabled = 0
+    # Restart the archive clock so the user is not archived again right away
+    doc.disabled_on = now()
+
+    for module in frappe.parse_json(archive.modules or "[]"):
+        doc.append("modules", module)
+
+    doc.insert(ignore_permissions=True)
+    archive.delete(ignore_permissions=True)
+
+    return doc
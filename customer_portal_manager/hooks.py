@@ -42,6 +42,20 @@ doc_events = {
     }
 }
 
+# Scheduled Tasks
+# ---------------
+scheduler_events = {
+    "hourly": [
+        "customer_portal_manager.customer_portal_manager.contact_sync.sync_portal_users"
+    ],
+    "daily": [
+        "customer_portal_manager.customer_portal_manager.access_schedule.update_user_access"
+    ],
+    "weekly": [
+        "customer_portal_manager.customer_portal_manager.user_archive.archive_users"
+    ]
+}
+
 # Permissions
 # -----------
 # Define custom permission rules here if needed
@@ -0,0 +1 @@
+# Patches for Customer Portal Manager
@@ -0,0 +1,19 @@
+"""
+Add (customer, date, name) indexes on the documents served by the customer
+data API so keyset pages are read straight from the index instead of sorting
+every document of the customer.
+"""
+
+import frappe
+
+from customer_portal_manager.api.customer_data import DOCUMENT_SOURCES
+
+
+def execute():
+    for source in DOCUMENT_SOURCES.values():
+        fields = [source["customer_field"], source["date_field"], "name"]
+        frappe.db.add_index(
+            source["doctype"],
+            fields,
+            index_name="portal_" + "_".join(fields)
+        )
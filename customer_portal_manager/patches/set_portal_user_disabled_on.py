@@ -0,0 +1,20 @@
+"""
+Backfill Customer Portal User.disabled_on for users disabled before the field
+existed. The last modification is the closest known disable time; rows never
+edited after creation were created disabled and are left without one.
+"""
+
+import frappe
+
+
+def execute():
+    frappe.reload_doc("customer_portal_manager", "doctype", "customer_portal_user")
+
+    frappe.db.sql("""
+        UPDATE `tabCustomer Portal User`
+        SET disabled_on = modified
+        WHERE enabled = 0
+            AND pending_activation = 0
+            AND disabled_on IS NULL
+            AND modified > creation
+    """)